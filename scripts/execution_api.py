@@ -27,16 +27,20 @@
  API towards the pyWinKeys module.
  Allows execution of keyboard and mouse operations by the use of string input.
 
- TODO: Allow 'write' to output upper-case characters
  TODO: Allow relative coordinates to be set as a mode in the script
  TODO: Allow scrolling actions to be performed in a script
  TODO: Maybe (?) add keyboard key holding/releasing support
 """
 import sys
-from typing import Union
+from typing import Dict, Optional, Union
 
 import pyWinKeys.winkeys.winkeys as pyw
 
+# Mouse button names (lower-case) and their corresponding keys
+_MOUSE_KEYS: Dict[str, pyw.MouseKey] = {'right': pyw.MouseKey.RIGHT_BUTTON,
+                                        'middle': pyw.MouseKey.MIDDLE_BUTTON,
+                                        'left': pyw.MouseKey.LEFT_BUTTON}
+
 
 class ExecutionAPI:
     @staticmethod
@@ -53,13 +57,11 @@ class ExecutionAPI:
         """
         Write a sequence on the keyboard.
         :param sequence: The keyboard sequence to write.
-        :return: True if all letters were written, False if a character couldn't be resolved.
+        :return: True if all letters were written, False otherwise.
         """
-        for c in sequence:
-            if not pyw.keyboard_press(c):
-                print("ExecutionAPI-write: Could not write character \'{0}\' in sequence \'{1}\'!"
-                      .format(c, sequence), file=sys.stderr)
-                return False
+        if not pyw.keyboard_press_sequence(sequence):
+            print("ExecutionAPI-write: Could not write sequence \'{0}\'!".format(sequence), file=sys.stderr)
+            return False
         return True
 
     @staticmethod
@@ -70,10 +72,25 @@ class ExecutionAPI:
         :param y: Y-coordinate in pixels.
         :return: True if a valid successful move, False otherwise.
         """
-        if not x.isdigit() or not y.isdigit():
+        try:
+            x_px, y_px = int(x), int(y)
+        except (TypeError, ValueError):
             print("ExecutionAPI-move: X or Y is not an integer x:\'{0}\' y:\'{1}\' !".format(x, y), file=sys.stderr)
-            return
-        return pyw.mouse_move(int(x), int(y), False)
+            return False
+        return pyw.mouse_move(x_px, y_px, False)
+
+    @staticmethod
+    def _resolve_mouse(key: str, caller: str) -> Union[pyw.MouseKey, None]:
+        """
+        Resolves the name of a mouse button (case-insensitive).
+        :param key: The mouse key name, "left", "right" or "middle".
+        :param caller: Name of the calling function, used in error messages.
+        :return: The mouse key, or None if the name is not a valid button.
+        """
+        key_code: Union[pyw.MouseKey, None] = _MOUSE_KEYS.get(key.lower())
+        if key_code is None:
+            print("ExecutionAPI-{0}: Invalid button \'{1}\'!".format(caller, key), file=sys.stderr)
+        return key_code
 
     @staticmethod
     def hold_mouse(key: str):
@@ -82,17 +99,8 @@ class ExecutionAPI:
         :param key: The mouse key to hold.
         :return: True if a valid key was held, False otherwise.
         """
-        key_code: Union[pyw.MouseKey, None] = None
-        if key.lower() == "right":
-            key_code = pyw.MouseKey.RIGHT_BUTTON
-        elif key.lower() == "middle":
-            key_code = pyw.MouseKey.MIDDLE_BUTTON
-        elif key.lower() == "left":
-            key_code = pyw.MouseKey.LEFT_BUTTON
-        if key_code is None:
-            print("ExecutionAPI-hold_mouse: Invalid button \'{0}\'!".format(key), file=sys.stderr)
-            return False
-        return pyw.mouse_hold(key_code)
+        key_code: Union[pyw.MouseKey, None] = ExecutionAPI._resolve_mouse(key, "hold_mouse")
+        return key_code is not None and pyw.mouse_hold(key_code)
 
     @staticmethod
     def release_mouse(key: str):
@@ -101,42 +109,31 @@ class ExecutionAPI:
         :param key: The mouse key to release.
         :return: True if a valid key was released, False otherwise.
         """
-        key_code: Union[pyw.MouseKey, None] = None
-        if key.lower() == "right":
-            key_code = pyw.MouseKey.RIGHT_BUTTON
-        elif key.lower() == "middle":
-            key_code = pyw.MouseKey.MIDDLE_BUTTON
-        elif key.lower() == "left":
-            key_code = pyw.MouseKey.LEFT_BUTTON
-        if key_code is None:
-            print("ExecutionAPI-release_mouse: Invalid button \'{0}\'!".format(key), file=sys.stderr)
-            return False
-        return pyw.mouse_release(key_code)
+        key_code: Union[pyw.MouseKey, None] = ExecutionAPI._resolve_mouse(key, "release_mouse")
+        return key_code is not None and pyw.mouse_release(key_code)
 
     @staticmethod
     def _hold_keyboard(key: str):
         """
         Holding is dangerous, make sure to release when using in a script.
         :param key: The key to hold.
-        :return: False if no valid key code exists, True otherwise.
+        :return: False if no valid key code exists or the event was not inserted, True otherwise.
         """
-        key_code = pyw._get_hex_code(key)
+        key_code: Optional[int] = pyw._get_hex_code(key)
         if key_code is None:
             print("ExecutionAPI-hold: key \'{0}\' has no valid key code!".format(key), file=sys.stderr)
             return False
-        pyw._keyboard_hold(key_code)
-        return True
+        return pyw._keyboard_hold(key_code)
 
     @staticmethod
     def _release_keyboard(key: str):
         """
         Releases a keyboard key, make sure to release when using hold in a script.
         :param key: The key to release.
-        :return: False if no valid key code exists, True otherwise.
+        :return: False if no valid key code exists or the event was not inserted, True otherwise.
         """
-        key_code = pyw._get_hex_code(key)
+        key_code: Optional[int] = pyw._get_hex_code(key)
         if key_code is None:
             print("ExecutionAPI-release: key \'{0}\' has no valid key code!".format(key), file=sys.stderr)
             return False
-        pyw._keyboard_release(key_code)
-        return True
+        return pyw._keyboard_release(key_code)
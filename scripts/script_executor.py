@@ -27,59 +27,252 @@
  Provides a simple script executor class, which utilizes a ScriptReader and an
  ExecutionAPI to perform scripted actions in a sequence.
 """
+import asyncio
 import sys
-from time import sleep
-from typing import List, Tuple, Dict, Callable
+import threading
+from queue import SimpleQueue
+from time import perf_counter, sleep
+from typing import Any, List, Tuple, Dict, Callable, Optional, Union
 
 from pyWinKeys.scripts.execution_api import ExecutionAPI
 from pyWinKeys.scripts.script_reader import ScriptReader
 
+# A compiled script consists of (delay s, opcode, parameters) commands
+_CompiledScript = List[Tuple[float, int, Tuple[str, ...]]]
+# A (handler, parameters) command
+_Command = Tuple[Callable[..., bool], Tuple[str, ...]]
+# Hands a command over to be performed elsewhere
+_PostCommand = Callable[[_Command], None]
+# Time (s) before a deadline which is busy-waited instead of slept, for sub-ms precision
+_SPIN_TIME: float = 0.001
+
 
 class ScriptExecutor:
-    # Allowed command strings and the amount of parameters, as well as handler to be defined.
-    # All parameters use ',' as delimiter
-    _commands: Dict[str, Tuple[int, Callable[..., bool]]] = {'press': (1, ExecutionAPI.press),
-                                                             'write': (1, ExecutionAPI.write),
-                                                             'move': (2, ExecutionAPI.move),
-                                                             'hold_mouse': (1, ExecutionAPI.hold_mouse),
-                                                             'release_mouse': (1, ExecutionAPI.release_mouse)}
-
-    def __init__(self, filename: str):
-        self.scripts: Dict = ScriptReader.load_scripts(filename)
+    # Allowed command strings and the amount of parameters, as well as the opcode of the command.
+    _commands: Dict[str, Tuple[int, int]] = {'press': (1, 0),
+                                             'write': (1, 1),
+                                             'move': (2, 2),
+                                             'hold_mouse': (1, 3),
+                                             'release_mouse': (1, 4)}
+    # Command handlers, indexed by opcode
+    _handlers: Tuple[Callable[..., bool], ...] = (ExecutionAPI.press,
+                                                  ExecutionAPI.write,
+                                                  ExecutionAPI.move,
+                                                  ExecutionAPI.hold_mouse,
+                                                  ExecutionAPI.release_mouse)
+
+    def __init__(self, filename: str, threaded_input: bool = False):
+        """
+        Loads and compiles all scripts from the given file.
+        :param filename: Name of the file containing the scripts.
+        :param threaded_input: If True, commands are handed over to a worker thread which performs the input
+        operations, so that the scheduling of commands is never held up by a slow input operation. Do not send input
+        through pyWinKeys from other threads meanwhile, the input events of both threads would be interleaved.
+        """
+        # Commands waiting to be performed by the worker thread, an event is set once the worker reaches it
+        # and None stops the worker
+        self._queue: 'Optional[SimpleQueue[Optional[Union[_Command, threading.Event]]]]' = \
+            SimpleQueue() if threaded_input else None
+        self._worker: Optional[threading.Thread] = None
+        # First exception raised by a command on the worker thread, re-raised by the next drain
+        self._worker_error: Optional[BaseException] = None
+        self.scripts: Optional[Dict[str, List[Tuple[int, str, Tuple[str, ...]]]]] = ScriptReader.load_scripts(filename)
+        # Only contains the scripts which consist of valid commands
+        self._compiled: Dict[str, _CompiledScript] = {}
+        self._executors: Dict[str, Callable[[], bool]] = {}
+        if self.scripts is not None:
+            for name, script in self.scripts.items():
+                try:
+                    compiled: _CompiledScript = self._compile(name, script)
+                except ValueError as e:
+                    print("ScriptExecutor-compile: {0}".format(e), file=sys.stderr)
+                    continue
+                self._compiled[name] = compiled
+                self._executors[name] = self._generate_executor(name, compiled,
+                                                                None if self._queue is None else self._queue.put)
+        # Only the scripts that can be executed, scripts with invalid commands are left out
+        self._names: Tuple[str, ...] = tuple(self._compiled)
         return
 
-    def _internal_execute(self, script: List[Tuple[int, str, str]]) -> bool:
+    def _compile(self, name: str, script: List[Tuple[int, str, Tuple[str, ...]]]) -> _CompiledScript:
         """
-        Internal execution loop for a script.
-        Thread will be reserved until the entire script has executed (or an error occurs)
+        Resolves the commands of a loaded script into their opcodes and validates the parameters,
+        so that nothing has to be looked up or checked while the script is executing.
+        :param name: The name of the script.
         :param script: The interpreted script which has been loaded.
-        :return: True if execution was successful, False if it aborted.
+        :return: The compiled script.
+        :raises ValueError: If the script contains an invalid command.
         """
-        for command in script:
+        compiled: _CompiledScript = []
+        for command_n, command in enumerate(script, 1):
             if len(command) != 3:
-                print("ScriptExecutor-internal_execute: Command is of wrong size {0}!"
-                      .format(len(command)), file=sys.stderr)
-                return False
-            # Run delay ms -> s
-            sleep(command[0] / 1000)
+                raise ValueError("Command {0} in script \'{1}\' is of wrong size {2}!"
+                                 .format(command_n, name, len(command)))
+            if not isinstance(command[0], int) or command[0] < 0:
+                raise ValueError("Command {0} in script \'{1}\' has an invalid delay \'{2}\'!"
+                                 .format(command_n, name, command[0]))
             # Check if command exists
-            if command[1] not in self._commands.keys():
-                print("ScriptExecutor-internal_execute: Command \'{0}\' does not exist!"
-                      .format(command[1]), file=sys.stderr)
-                return False
-            # TODO: Add escaping, eg. \\\, -> \, where , not used for split
-            parameters: List[str] = command[2].split(",")
-            if len(parameters) != self._commands[command[1]][0]:
-                print("ScriptExecutor-internal_execute: Command \'{0}\' expects \'{1}\' parameters, got \'{2}\'"
-                      .format(command[1], self._commands[command[1]][0], len(parameters)), file=sys.stderr)
-                return False
-            # Execute command with the parameters
-            # print("ScriptExecutor-internal_execute: EXECUTING command \'{0}\'".format(command[1]))
-            self._commands[command[1]][1](*parameters)
+            if command[1] not in self._commands:
+                raise ValueError("Command {0} \'{1}\' in script \'{2}\' does not exist!"
+                                 .format(command_n, command[1], name))
+            arity: int
+            opcode: int
+            arity, opcode = self._commands[command[1]]
+            parameters: Tuple[str, ...] = command[2]
+            if len(parameters) != arity:
+                raise ValueError("Command {0} \'{1}\' in script \'{2}\' expects \'{3}\' parameters, got \'{4}\'!"
+                                 .format(command_n, command[1], name, arity, len(parameters)))
+            # Delay ms -> s
+            compiled.append((command[0] / 1000, opcode, parameters))
+        return compiled
+
+    @staticmethod
+    def _wait_until(deadline: float) -> None:
+        """
+        Waits until the given perf_counter deadline has been reached.
+        :param deadline: The perf_counter time (s) to wait for.
+        """
+        remaining: float = deadline - perf_counter()
+        if remaining > _SPIN_TIME:
+            sleep(remaining - _SPIN_TIME)
+        while perf_counter() < deadline:
+            pass
+
+    @staticmethod
+    def _generate_executor(name: str, script: _CompiledScript, post: Optional[_PostCommand]) -> Callable[[], bool]:
+        """
+        Generates a function which executes a compiled script as straight-line code, one call per command.
+        Thread will be reserved until the entire script has executed.
+        Delays are scheduled relative to the start of the script, so the time spent executing a command
+        does not delay the commands that follow it.
+        :param name: The name of the script.
+        :param script: The compiled script.
+        :param post: If given, commands are passed to post as (handler, parameters) instead of being called.
+        :return: Function executing the script, returns True if execution was successful, False if it aborted.
+        """
+        namespace: Dict[str, Any] = {'_perf_counter': perf_counter, '_wait_until': ScriptExecutor._wait_until,
+                                     '_post': post}
+        source: List[str] = ["def _execute():",
+                             "    _deadline = _perf_counter()"]
+        for delay, opcode, parameters in script:
+            handler_name: str = "_{0}".format(ScriptExecutor._handlers[opcode].__name__)
+            namespace[handler_name] = ScriptExecutor._handlers[opcode]
+            # Commands without delay follow the previous one directly, they never have anything to wait for
+            if delay:
+                source.append("    _deadline += {0!r}".format(delay))
+                source.append("    _wait_until(_deadline)")
+            if post is None:
+                source.append("    {0}({1})".format(handler_name, ", ".join(repr(p) for p in parameters)))
+            else:
+                source.append("    _post(({0}, {1!r}))".format(handler_name, parameters))
+        source.append("    return True")
+        exec(compile("\n".join(source), "<script:{0}>".format(name), "exec"), namespace)
+        return namespace["_execute"]
+
+    @staticmethod
+    async def _internal_execute_async(script: _CompiledScript, post: Optional[_PostCommand]) -> bool:
+        """
+        Asynchronous execution loop for a compiled script.
+        The running event loop is free to run other tasks while the script waits for its next command.
+        :param script: The compiled script.
+        :param post: If given, commands are passed to post as (handler, parameters) instead of being called.
+        :return: True if execution was successful, False if it aborted.
+        """
+        delay: float
+        opcode: int
+        parameters: Tuple[str, ...]
+        handlers: Tuple[Callable[..., bool], ...] = ScriptExecutor._handlers
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        deadline: float = loop.time()
+        for delay, opcode, parameters in script:
+            if delay:
+                deadline += delay
+                remaining: float = deadline - loop.time()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+            if post is None:
+                handlers[opcode](*parameters)
+            else:
+                post((handlers[opcode], parameters))
         return True
 
-    def get_script_names(self) -> tuple[str]:
-        return tuple(self.scripts.keys()) if self.scripts is not None else tuple()
+    def _worker_loop(self) -> None:
+        """
+        Worker thread loop, performs the queued commands in order until None is received.
+        Once a command raises, the remaining commands are skipped until the next drain event, just like an
+        exception aborts the rest of a script that is executed without a worker thread.
+        """
+        queue = self._queue
+        assert queue is not None
+        while True:
+            command: Optional[Union[_Command, threading.Event]] = queue.get()
+            if command is None:
+                return
+            if isinstance(command, threading.Event):
+                command.set()
+            elif self._worker_error is None:
+                try:
+                    command[0](*command[1])
+                except Exception as e:
+                    self._worker_error = e
+
+    def _start_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._worker_loop, name="ScriptExecutor-worker", daemon=True)
+            self._worker.start()
+
+    def _drain(self) -> None:
+        """
+        Blocks until the worker thread has performed all commands queued so far.
+        :raises Exception: The exception raised by a command performed by the worker thread, if any.
+        """
+        queue = self._queue
+        assert queue is not None
+        done: threading.Event = threading.Event()
+        queue.put(done)
+        done.wait()
+        error: Optional[BaseException] = self._worker_error
+        if error is not None:
+            self._worker_error = None
+            raise error
+
+    def close(self) -> None:
+        """
+        Stops the worker thread (if any) after it has performed all queued commands.
+        """
+        if self._worker is not None and self._worker.is_alive():
+            assert self._queue is not None
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+    def __enter__(self) -> 'ScriptExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get_script_names(self) -> Tuple[str, ...]:
+        """
+        :return: The names of all loaded scripts which can be executed (scripts with invalid commands are excluded).
+        """
+        return self._names
+
+    def _get_compiled(self, script_name: str, caller: str) -> Optional[_CompiledScript]:
+        """
+        Retrieves the compiled script 'script_name'.
+        :param script_name: The name of the script (eg. the --- name tag in the loaded script file).
+        :param caller: Name of the calling function, used in error messages.
+        :return: The compiled script, or None if it was not loaded or contains invalid commands.
+        """
+        if not self.scripts or script_name not in self.scripts:
+            print("ScriptExecutor-{0}: No script \'{1}\' loaded!".format(caller, script_name), file=sys.stderr)
+            return None
+        if script_name not in self._compiled:
+            print("ScriptExecutor-{0}: Script \'{1}\' contains invalid commands!".format(caller, script_name),
+                  file=sys.stderr)
+            return None
+        return self._compiled[script_name]
 
     def execute(self, script_name: str) -> bool:
         """
@@ -87,7 +280,27 @@ class ScriptExecutor:
         :param script_name: The name of the script (eg. the --- name tag in the loaded script file).
         :return: True if execution was successful, False otherwise.
         """
-        if not self.scripts or script_name not in self.scripts.keys():
-            print("ScriptExecutor-execute: No script \'{0}\' loaded!".format(script_name), file=sys.stderr)
+        if self._get_compiled(script_name, "execute") is None:
+            return False
+        if self._queue is None:
+            return self._executors[script_name]()
+        self._start_worker()
+        result: bool = self._executors[script_name]()
+        self._drain()
+        return result
+
+    async def execute_async(self, script_name: str) -> bool:
+        """
+        Executes script 'script_name' which has to exist in the loaded file, without blocking the event loop.
+        :param script_name: The name of the script (eg. the --- name tag in the loaded script file).
+        :return: True if execution was successful, False otherwise.
+        """
+        script: Optional[_CompiledScript] = self._get_compiled(script_name, "execute_async")
+        if script is None:
             return False
-        return self._internal_execute(self.scripts[script_name])
+        if self._queue is None:
+            return await self._internal_execute_async(script, None)
+        self._start_worker()
+        result: bool = await self._internal_execute_async(script, self._queue.put)
+        await asyncio.get_running_loop().run_in_executor(None, self._drain)
+        return result
@@ -34,50 +34,30 @@
  TODO: Add support for initial script values (specified by the reserved % tag)
 """
 import os
-import string
+import re
 import sys
-from typing import Union, Tuple
+from typing import Dict, List, Union, Tuple
 
+# A command line has the format: delay, cmd, "parameters" (any text following the parameters is ignored)
+_LINE_RE = re.compile(r'^\s*(\d+)\s*,\s*(\w+)\s*,\s*"((?:[^"\\]|\\[\\",]|\\)*)".*$')
+# A script tag has the format: --- name (any tag closes the currently open script)
+_HEADER_RE = re.compile(r'^\s*---(.*)$')
+# Empty rows, comment rows and initial value rows (%)
+_SKIP_RE = re.compile(r'^\s*(?:[#%]|$)')
+# Inside the parameters only \" -> ", \\ -> \ and \, -> , are escapes, any other backslash is kept as is
+_UNESCAPE_RE = re.compile(r'\\([\\",])')
+# A parameter followed by its ',' delimiter, an escaped ',' is part of the parameter
+_PARAMETER_RE = re.compile(r'((?:\\[\\",]|[^,\\]|\\)*),')
 
-class ScriptReader:
-    @staticmethod
-    def _contains_prefix(prefix: str, line: str) -> bool:
-        # Sanity check
-        if len(prefix) > len(line) or len(line) == 0:
-            return False
-        for i in range(0, len(prefix)):
-            if prefix[i] != line[i]:
-                return False
-        return True
-
-    @staticmethod
-    def _remove_obsolete_characters(mark_char: str, rm_chars: Union[Tuple[str, ...], str], line: str) -> str:
-        """
-        Purges a line of text from all rm_char characters that are not inside a group marked by mark_char characters.
-        :param mark_char: MUST be of length 1 and only one (Character to match start/end of a group).
-        :param rm_chars: MUST be a tuple consisting of strings of length 1 (Characters to remove).
-        :param line: input string.
-        :return: Cleaned string.
-        """
-        output: str = ""
-        found: bool = False
-        for i in range(0, len(line)):
-            if line[i] == mark_char:
-                # Make sure that it is not escaped!
-                # TODO: Add smarter escaping (eg. read \ before interpreting the following character e.g \\\"->\")
-                if i != 0 and line[i - 1] != '\\':
-                    found = not found
-            if found or (not found and line[i] not in rm_chars):
-                output += line[i]
-        return output
 
+class ScriptReader:
     @staticmethod
-    def load_scripts(filename: str) -> Union[dict, None]:
+    def load_scripts(filename: str) -> Union[Dict[str, List[Tuple[int, str, Tuple[str, ...]]]], None]:
         """
         Loads all scripts from the given file located in the same folder or from a sub-folder.
 
         The loaded script data has the following format, with the list being ordered:
-        {'script name': [(delay, cmd, "parameters"), (delay, cmd, "parameters"), ...]
+        {'script name': [(delay, cmd, ("param1", "param2", ...)), (delay, cmd, ("param1", ...)), ...]
         ,
         'script name2':...
         ,
@@ -85,59 +65,53 @@ class ScriptReader:
         :param filename: Name of the file containing the scripts.
         :return: Any scripts from the given file, or None if the file does not exist or if it was empty.
         """
-        scripts: dict = {}
+        scripts: Dict[str, List[Tuple[int, str, Tuple[str, ...]]]] = {}
         if not os.path.isfile(filename):
             return None
 
         s_name: str = ""  # Current script name
-        with open(filename, 'r') as f:
-            for line_n, line in enumerate(f, 1):
-                # Remove all whitespaces appearing outside parameters, eg outside " " groups
-                temp: str = ScriptReader._remove_obsolete_characters('\"', string.whitespace, line)
-                # Traverse til we find a script
-                if not s_name:
-                    if ScriptReader._contains_prefix("---", temp):
-                        if len(temp) < 4:
-                            print("load_scripts: ERROR: script at line {0} has no name!"
-                                  .format(line_n), file=sys.stderr)
-                            return None
-                        s_name = temp[3:]
-                        if s_name in scripts.keys():
-                            print("load_scripts: ERROR: dict already contains a script with name {0}!"
-                                  .format(s_name), file=sys.stderr)
-                            return None
-                        # print("load_scripts: READING script \'{0}\'".format(s_name))
-                        scripts[s_name] = list()
-                # Otherwise, try to read commands in script until we reach the end
-                else:
-                    # Ignore empty rows and comment rows (and initial values % as well for now)
-                    if len(temp) == 0 or temp[0] in ('#', '%'):
-                        continue
-                    # Close script if an exit tag is found
-                    elif ScriptReader._contains_prefix("---", temp):
-                        # print("load_scripts: FINISHING script \'{0}\'".format(s_name))
-                        s_name = ""
-                        continue
-                    first_split = temp.find(',')
-                    second_split = temp.find(',', first_split + 1)
-                    first_param = temp.find('\"', second_split + 1)
-                    second_param = temp.find("\"", first_param + 1)
-                    if first_split <= 0 or second_split <= 0 or first_param <= 0 or second_param <= 0 or \
-                            second_split <= first_split or first_param <= second_split or second_param <= first_param:
-                        print("load_scripts: ERROR, invalid split indexes {0}, {1}, {2}, {3} string [{4}]"
-                              .format(first_split, second_split, first_param, second_param, temp)
-                              , file=sys.stderr)
+        # utf-8-sig skips the byte order mark some editors (eg. Notepad) write at the start of the file.
+        # Only split at line feeds (universal newlines translates \r\n and \r), splitlines() would also split
+        # parameters at characters such as \x0b, \x0c or \u2028
+        with open(filename, 'r', encoding='utf-8-sig') as f:
+            lines: List[str] = f.read().split('\n')
+        for line_n, line in enumerate(lines, 1):
+            header = _HEADER_RE.match(line)
+            # Traverse til we find a script
+            if not s_name:
+                if header:
+                    # Whitespaces are not part of the script name
+                    s_name = "".join(header[1].split())
+                    if not s_name:
+                        print("load_scripts: ERROR: script at line {0} has no name!"
+                              .format(line_n), file=sys.stderr)
                         return None
-                    delay_str = temp[:first_split]
-                    cmd_str = temp[first_split + 1:second_split]
-                    param_str = temp[first_param + 1:second_param]
-                    # Get start and end of parameters (in case of comments)
-                    if not delay_str.isdigit():
-                        print("load_scripts: ERROR, delay not an integer \'{0}\'".format(delay_str)
-                              , file=sys.stderr)
+                    if s_name in scripts:
+                        print("load_scripts: ERROR: dict already contains a script with name {0}!"
+                              .format(s_name), file=sys.stderr)
                         return None
-                    # Add command to list, it's up to the command executing mechanism to test command eligibility
-                    scripts[s_name].append((int(delay_str), cmd_str, param_str))
-                    # print("load_scripts: SUCCESS, read delay={0}, cmd_str=\'{1}\' params=\'{2}\'"
-                    #      .format(int(delay_str), cmd_str, param_str))
+                    # print("load_scripts: READING script \'{0}\'".format(s_name))
+                    scripts[s_name] = list()
+            # Otherwise, try to read commands in script until we reach the end
+            else:
+                # Close script if an exit tag is found
+                if header:
+                    # print("load_scripts: FINISHING script \'{0}\'".format(s_name))
+                    s_name = ""
+                    continue
+                # Ignore empty rows and comment rows (and initial values % as well for now)
+                if _SKIP_RE.match(line):
+                    continue
+                m = _LINE_RE.match(line)
+                if m is None:
+                    print("load_scripts: ERROR, invalid command at line {0} string [{1}]"
+                          .format(line_n, line.rstrip()), file=sys.stderr)
+                    return None
+                # All parameters use ',' as delimiter, unless it is escaped
+                parameters: Tuple[str, ...] = tuple(_UNESCAPE_RE.sub(r'\1', parameter)
+                                                    for parameter in _PARAMETER_RE.findall(m[3] + ","))
+                # Add command to list, it's up to the command executing mechanism to test command eligibility
+                scripts[s_name].append((int(m[1]), m[2], parameters))
+                # print("load_scripts: SUCCESS, read delay={0}, cmd_str=\'{1}\' params=\'{2}\'"
+                #      .format(int(m[1]), m[2], parameters))
         return scripts
@@ -31,20 +31,24 @@ Supports:
 - Performing mouse scrolling operations in any directions
 - Performing keyboard button presses (including media buttons, see _win_key dict initialization)
 - Perform multi-key keyboard combinations
+- Writing sequences of text (including capitalized letters and special symbols, see keyboard_press_sequence)
 - Retrieving the current mouse position
 Does not (really) support:
-- Writing capitalized letters (can be done by toggling 'caps') 
-- Writing special symbols (can be made by holding down the correct modifier buttons)
+- Pressing capitalized letters as keys (can be done by toggling 'caps')
+- Pressing special symbols as keys (can be made by holding down the correct modifier buttons)
 """
 
+from __future__ import annotations
+
 import os
 
 if os.name == "nt":
+    import atexit
     import ctypes
     import enum
-    import string
-    import time
-    import typing
+    import functools
+    import threading
+    import types
 
     '''
     Setup all types required to communicate with the user32 API
@@ -89,7 +93,37 @@ if os.name == "nt":
 
     class CInput(ctypes.Structure):
         _fields_ = [('type', ctypes.c_ulong),
-                    ('ctypes.Union', _CInputUnion)]
+                    ('u', _CInputUnion)]
+
+
+    '''
+    Bind the user32 functions once, with their prototypes
+    '''
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _SendInput = _user32.SendInput
+    _SendInput.argtypes = [ctypes.c_uint, ctypes.POINTER(CInput), ctypes.c_int]
+    _SendInput.restype = ctypes.c_uint
+    _GetCursorPos = _user32.GetCursorPos
+    _GetCursorPos.argtypes = [ctypes.POINTER(CPoint)]
+    _GetCursorPos.restype = ctypes.c_int
+    _GetSystemMetrics = _user32.GetSystemMetrics
+    _GetSystemMetrics.argtypes = [ctypes.c_int]
+    _GetSystemMetrics.restype = ctypes.c_int
+    _MapVirtualKey = _user32.MapVirtualKeyW
+    _MapVirtualKey.argtypes = [ctypes.c_uint, ctypes.c_uint]
+    _MapVirtualKey.restype = ctypes.c_uint
+    _CINPUT_SIZE: int = ctypes.sizeof(CInput)
+
+    _Sleep = ctypes.WinDLL('kernel32').Sleep
+    _Sleep.argtypes = [ctypes.c_ulong]
+    _Sleep.restype = None
+
+    # Raise the system timer resolution to 1 ms, otherwise short sleeps are rounded up to the default ~15.6 ms
+    _winmm = ctypes.WinDLL('winmm')
+    _winmm.timeBeginPeriod.argtypes = [ctypes.c_uint]
+    _winmm.timeEndPeriod.argtypes = [ctypes.c_uint]
+    _winmm.timeBeginPeriod(1)
+    atexit.register(_winmm.timeEndPeriod, 1)
 
 
     class MouseKey(enum.IntEnum):
@@ -112,11 +146,15 @@ if os.name == "nt":
     INPUT_MOUSE = 0x00
     INPUT_KEYBOARD = 0x01
     INPUT_HARDWARE = 0x02
+    # Input types as ctypes values, created once for all CInput constructions
+    _C_INPUT_MOUSE = ctypes.c_ulong(INPUT_MOUSE)
+    _C_INPUT_KEYBOARD = ctypes.c_ulong(INPUT_KEYBOARD)
     # Key events
     KEY_EVENT_EXTENDED_KEY = 0x0001
     KEY_EVENT_RELEASE = 0x0002
     KEY_EVENT_UNICODE = 0x0004
     KEY_EVENT_SCAN_CODE = 0x0008
+    MAPVK_VK_TO_VSC = 0
     # Mouse events (https://docs.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-mouseinput)
     MOUSE_WHEEL_DELTA = 120  # Value per scroll tick
     MOUSE_EVENT_MOVE = 0x0001  # Mouse is moving
@@ -133,16 +171,32 @@ if os.name == "nt":
     MOUSE_EVENT_MIDDLE_RELEASE = 0x0040
     MOUSE_EVENT_VIRTUAL_DESK = 0x4000  # Send this to map mouse events to the entire screen area (multi-monitor)
     MOUSE_EVENT_COORDINATES = 65535  # The amount of coordinates in x and y used by mouse input
+    # Mouse event flags for holding and releasing each mouse button
+    _MOUSE_HOLD_FLAGS: dict[MouseKey, int] = {MouseKey.RIGHT_BUTTON: MOUSE_EVENT_RIGHT_PRESS,
+                                              MouseKey.LEFT_BUTTON: MOUSE_EVENT_LEFT_PRESS,
+                                              MouseKey.MIDDLE_BUTTON: MOUSE_EVENT_MIDDLE_PRESS}
+    _MOUSE_RELEASE_FLAGS: dict[MouseKey, int] = {MouseKey.RIGHT_BUTTON: MOUSE_EVENT_RIGHT_RELEASE,
+                                                 MouseKey.LEFT_BUTTON: MOUSE_EVENT_LEFT_RELEASE,
+                                                 MouseKey.MIDDLE_BUTTON: MOUSE_EVENT_MIDDLE_RELEASE}
+    # Scroll direction sign and mouse event flags for each scroll direction
+    _MOUSE_SCROLL: dict[MouseScrollDirection, tuple[int, int]] = {
+        MouseScrollDirection.DOWN: (-MOUSE_WHEEL_DELTA, MOUSE_EVENT_WHEEL),
+        MouseScrollDirection.UP: (MOUSE_WHEEL_DELTA, MOUSE_EVENT_WHEEL),
+        MouseScrollDirection.LEFT: (-MOUSE_WHEEL_DELTA, MOUSE_EVENT_WHEEL | MOUSE_EVENT_HWHEEL),
+        MouseScrollDirection.RIGHT: (MOUSE_WHEEL_DELTA, MOUSE_EVENT_WHEEL | MOUSE_EVENT_HWHEEL)}
 
     # Screen settings
     _SCREEN_WIDTH_PX: int = 0
     _SCREEN_HEIGHT_PX: int = 0
-    _SCREEN_X_MULTIPLIER: int = 0
-    _SCREEN_Y_MULTIPLIER: int = 0
+    _SCREEN_X_MULTIPLIER: float = 0.0
+    _SCREEN_Y_MULTIPLIER: float = 0.0
 
     # Timeout (delay) settings
     _PYWINKEYS_TIMEOUT: int = 5  # ms, keypress timeout
     _PYWINKEYS_SEQUENCE_DELAY: int = 0  # ms, delay of subsequent keypresses in a keycombo
+    # Mouse move settings
+    _PYWINKEYS_SKIP_REDUNDANT_MOVES: bool = True  # Skip absolute moves to the position the cursor is already at
+    _LAST_ABS_XY: tuple[float, float] | None = None  # Position of the last absolute move
 
 
     def refresh_monitor_size() -> None:
@@ -154,10 +208,11 @@ if os.name == "nt":
         global _SCREEN_WIDTH_PX
         global _SCREEN_X_MULTIPLIER
         global _SCREEN_Y_MULTIPLIER
-        _SCREEN_WIDTH_PX = ctypes.windll.user32.GetSystemMetrics(0)
-        _SCREEN_HEIGHT_PX = ctypes.windll.user32.GetSystemMetrics(1)
-        _SCREEN_X_MULTIPLIER = MOUSE_EVENT_COORDINATES // _SCREEN_WIDTH_PX
-        _SCREEN_Y_MULTIPLIER = MOUSE_EVENT_COORDINATES // _SCREEN_HEIGHT_PX
+        _SCREEN_WIDTH_PX = _GetSystemMetrics(0)
+        _SCREEN_HEIGHT_PX = _GetSystemMetrics(1)
+        # Map the first pixel to coordinate 0 and the last pixel to MOUSE_EVENT_COORDINATES
+        _SCREEN_X_MULTIPLIER = MOUSE_EVENT_COORDINATES / max(_SCREEN_WIDTH_PX - 1, 1)
+        _SCREEN_Y_MULTIPLIER = MOUSE_EVENT_COORDINATES / max(_SCREEN_HEIGHT_PX - 1, 1)
 
 
     # Set initial resolution of primary monitor for mouse event mappings
@@ -186,86 +241,187 @@ if os.name == "nt":
             _PYWINKEYS_SEQUENCE_DELAY = delay
 
 
-    def get_primary_resolution() -> typing.Tuple[int, int]:
+    def set_skip_redundant_moves(skip: bool) -> None:
+        """
+        Updates whether absolute mouse moves to the current cursor position are skipped, disable to send every move.
+        :param skip: New setting
+        :return: None
+        """
+        global _PYWINKEYS_SKIP_REDUNDANT_MOVES
+        global _LAST_ABS_XY
+        if isinstance(skip, bool):
+            _PYWINKEYS_SKIP_REDUNDANT_MOVES = skip
+            _LAST_ABS_XY = None
+
+
+    def get_primary_resolution() -> tuple[int, int]:
         return _SCREEN_WIDTH_PX, _SCREEN_HEIGHT_PX
 
 
     '''
     Map characters and special keys to the correct VK keys for KeyBdInput
     '''
-    _win_key = {}  # Key code fetch dict (Keyboard)
-
-
-    def _add_sequence_keys(key_dict: dict, keys: typing.Union[str, typing.Tuple[str, ...]], start: int) -> None:
-        for key, value in zip(keys, range(start, start + len(keys))):
-            key_dict[key] = value
-
-
-    # Load numbers and letters and functions keys
-    _add_sequence_keys(_win_key, string.digits, 0x30)
-    # Use unicode for all letters
-    _add_sequence_keys(_win_key, string.ascii_lowercase, 0x41)
+    _LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+    _UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    # Single (ASCII) characters, indexed by ord(character), a VK of 0 means the character has no key
+    _vk_by_ord: list[int] = [0] * 128
+    # Load numbers and letters
+    for _i, _char in enumerate('0123456789'):
+        _vk_by_ord[ord(_char)] = 0x30 + _i
     # Can't really differentiate between lower and upper for VK (if we don't use shift modifiers...)
-    _add_sequence_keys(_win_key, string.ascii_uppercase, 0x41)
-    _add_sequence_keys(_win_key, ('F1', 'F2', 'F3', 'F4', 'F5', 'F6', 'F7', 'F8', 'F9', 'F10',
-                                  'F11', 'F12', 'F13', 'F14', 'F15', 'F16', 'F17', 'F18',
-                                  'F19', 'F20', 'F21', 'F22', 'F23', 'F24'), 0x70)
+    for _i, (_lower, _upper) in enumerate(zip(_LOWERCASE, _UPPERCASE)):
+        _vk_by_ord[ord(_lower)] = _vk_by_ord[ord(_upper)] = 0x41 + _i
     # Manually add symbols
-    _win_key['+'] = 0xBB
-    _win_key[','] = 0xBC
-    _win_key['-'] = 0xBD
-    _win_key['.'] = 0xBE
-    # Manually input special keys
-    _win_key['backspace'] = 0x08
-    _win_key['tab'] = 0x09
-    _win_key['enter'] = 0x0D
-    _win_key['shift'] = 0x10
-    _win_key['ctrl'] = 0x11
-    _win_key['alt'] = 0x12
-    _win_key['pause'] = 0x13
-    _win_key['caps'] = 0x14
-    _win_key['esc'] = 0x1B
-    _win_key['space'] = 0x20
-    _win_key['page-up'] = 0x21
-    _win_key['page-down'] = 0x22
-    _win_key['end'] = 0x23
-    _win_key['home'] = 0x24
-    _win_key['left'] = 0x25
-    _win_key['up'] = 0x26
-    _win_key['right'] = 0x27
-    _win_key['down'] = 0x28
-    _win_key['select'] = 0x29
-    _win_key['print'] = 0x2A
-    _win_key['execute'] = 0x2B
-    _win_key['prtscn'] = 0x2C
-    _win_key['insert'] = 0x2D
-    _win_key['delete'] = 0x2E
-    _win_key['win'] = 0x5B  # Left windows key
-    _win_key['vol-mute'] = 0xAD
-    _win_key['vol-down'] = 0xAE
-    _win_key['vol-up'] = 0xAF
-    _win_key['media-next'] = 0xB0
-    _win_key['media-prev'] = 0xB1
-    _win_key['media-stop'] = 0xB2
-    _win_key['media_pp'] = 0xB3  # VK_MEDIA_PLAY_PAUSE
-
-
-    def _get_hex_code(key: str) -> int:
+    _vk_by_ord[ord('+')] = 0xBB
+    _vk_by_ord[ord(',')] = 0xBC
+    _vk_by_ord[ord('-')] = 0xBD
+    _vk_by_ord[ord('.')] = 0xBE
+
+    # Key code fetch dict (Keyboard), the single characters followed by the named keys
+    _win_key: dict[str, int] = {
+        **{chr(i): key_code for i, key_code in enumerate(_vk_by_ord) if key_code},
+        # Function keys, accepted in both cases
+        **{'F%d' % (i + 1): 0x70 + i for i in range(24)},
+        **{'f%d' % (i + 1): 0x70 + i for i in range(24)},
+        # Special keys
+        'backspace': 0x08,
+        'tab': 0x09,
+        'enter': 0x0D,
+        'shift': 0x10,
+        'ctrl': 0x11,
+        'alt': 0x12,
+        'pause': 0x13,
+        'caps': 0x14,
+        'esc': 0x1B,
+        'space': 0x20,
+        'page-up': 0x21,
+        'page-down': 0x22,
+        'end': 0x23,
+        'home': 0x24,
+        'left': 0x25,
+        'up': 0x26,
+        'right': 0x27,
+        'down': 0x28,
+        'select': 0x29,
+        'print': 0x2A,
+        'execute': 0x2B,
+        'prtscn': 0x2C,
+        'insert': 0x2D,
+        'delete': 0x2E,
+        'win': 0x5B,  # Left windows key
+        'vol-mute': 0xAD,
+        'vol-down': 0xAE,
+        'vol-up': 0xAF,
+        'media-next': 0xB0,
+        'media-prev': 0xB1,
+        'media-stop': 0xB2,
+        'media_pp': 0xB3,  # VK_MEDIA_PLAY_PAUSE
+    }
+    del _vk_by_ord, _i, _char, _lower, _upper
+    # Read-only view of the key codes, for external readers
+    _win_key_view: types.MappingProxyType[str, int] = types.MappingProxyType(_win_key)
+    # Retrieves the VK for the given key, None if the key does not exist (bound directly, saving a function call)
+    _get_hex_code = _win_key.get
+
+
+    # VKs of the keys that send the extended (0xE0) scan code prefix
+    _EXTENDED_VKS: frozenset[int] = frozenset((0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E,
+                                               0x5B, 0xAD, 0xAE, 0xAF, 0xB0, 0xB1, 0xB2, 0xB3))
+    # VKs of the keys whose make code is a special sequence that a single scan code event can not reproduce, these are
+    # sent as VK only: pause (E1 1D 45, MAPVK_VK_TO_VSC returns the num lock scan code 0x45) and prtscn (E0 2A E0 37,
+    # MAPVK_VK_TO_VSC returns the Alt + SysRq scan code 0x54)
+    _VK_ONLY_VKS: frozenset[int] = frozenset((0x13, 0x2C))
+
+
+    def _scan_code_event(key_code: int) -> tuple[int, int]:
         """
-        Retrieves the VK for the given key
-        :param key:
-        :return: (key_code) None if the character does not exist.
+        Retrieves the scan code of the given VK, many applications (e.g. games) ignore events that only contain a VK.
+        :param key_code:
+        :return: (scan_code, flags) the flags of a key hold, (0, 0) if the VK has no scan code and has to be sent as is.
         """
-        return _win_key.get(key, None)
+        if key_code in _VK_ONLY_VKS:
+            return 0, 0
+        scan_code = _MapVirtualKey(key_code, MAPVK_VK_TO_VSC)
+        if scan_code == 0:
+            return 0, 0
+        if key_code in _EXTENDED_VKS:
+            return scan_code, KEY_EVENT_SCAN_CODE | KEY_EVENT_EXTENDED_KEY
+        return scan_code, KEY_EVENT_SCAN_CODE
+
+
+    # Scan codes and hold flags of every key, computed once
+    _SCAN_CODES: dict[int, tuple[int, int]] = {key_code: _scan_code_event(key_code)
+                                               for key_code in set(_win_key.values())}
+
+    # Preassembled hold and release input events for every key
+    _KEY_HOLD: dict[str, CInput] = {
+        key: CInput(_C_INPUT_KEYBOARD, _CInputUnion(ki=CKeyBdInput(wVk=key_code, wScan=_SCAN_CODES[key_code][0],
+                                                                   dwFlags=_SCAN_CODES[key_code][1])))
+        for key, key_code in _win_key.items()}
+    _KEY_RELEASE: dict[str, CInput] = {
+        key: CInput(_C_INPUT_KEYBOARD,
+                    _CInputUnion(ki=CKeyBdInput(wVk=key_code, wScan=_SCAN_CODES[key_code][0],
+                                                dwFlags=_SCAN_CODES[key_code][1] | KEY_EVENT_RELEASE)))
+        for key, key_code in _win_key.items()}
+
+
+    # Translation table for key combos, drops whitespace and lowercases the key names
+    _COMBO_TABLE = str.maketrans(_UPPERCASE, _LOWERCASE, ' \t\n\r\x0b\x0c')
 
 
     def _sleep(ms: int) -> None:
         if ms > 0:
-            time.sleep(ms / 1000.0)
+            _Sleep(int(ms))
 
 
-    def _send_input(c_input: CInput) -> None:
-        ctypes.windll.user32.SendInput(1, ctypes.byref(c_input), ctypes.sizeof(c_input))
+    '''
+    Preallocated input events, which are updated and sent instead of constructing new events on every call.
+    Filling and sending a preallocated event (or reading the preallocated cursor position) is done while holding
+    _TEMPLATE_LOCK, so that events are not corrupted when input is sent from more than one thread.
+    '''
+    _TEMPLATE_LOCK = threading.Lock()
+    _MOUSE_TEMPLATE = CInput(_C_INPUT_MOUSE)
+    _KBD_TEMPLATE = CInput(_C_INPUT_KEYBOARD)
+    _MOUSE_PRESS_TEMPLATE = (CInput * 2)(CInput(_C_INPUT_MOUSE), CInput(_C_INPUT_MOUSE))
+    # Views into the event data of the templates
+    _MOUSE_TEMPLATE_MI: CMouseInput = _MOUSE_TEMPLATE.u.mi
+    _KBD_TEMPLATE_KI: CKeyBdInput = _KBD_TEMPLATE.u.ki
+    _MOUSE_PRESS_TEMPLATE_MI: tuple[CMouseInput, CMouseInput] = (_MOUSE_PRESS_TEMPLATE[0].u.mi,
+                                                                 _MOUSE_PRESS_TEMPLATE[1].u.mi)
+
+
+    def _send_input(c_input: CInput) -> bool:
+        """
+        Sends a single input event, returns false if the event was not inserted into the input stream (e.g. by UIPI).
+        """
+        return _SendInput(1, ctypes.byref(c_input), _CINPUT_SIZE) == 1
+
+
+    def _send_inputs(inputs: ctypes.Array, n: int) -> bool:
+        """
+        Sends the first n input events of the given CInput array with a single SendInput call.
+        Returns false if not all events were inserted into the input stream.
+        """
+        return _SendInput(n, inputs, _CINPUT_SIZE) == n
+
+
+    # The event data of the preallocated mouse event, cleared before every new mouse event
+    _MOUSE_TEMPLATE_UNION_ADDRESS = ctypes.addressof(_MOUSE_TEMPLATE) + CInput.u.offset
+    _CINPUT_UNION_SIZE = ctypes.sizeof(_CInputUnion)
+
+
+    def _reset_mouse() -> CMouseInput:
+        """
+        Clears the event data of the preallocated mouse event (keeping the input type) with a single memset.
+        Only call this while holding _TEMPLATE_LOCK.
+        :return: The cleared mouse event data, only the relevant fields have to be set before sending.
+        """
+        ctypes.memset(_MOUSE_TEMPLATE_UNION_ADDRESS, 0, _CINPUT_UNION_SIZE)
+        return _MOUSE_TEMPLATE_MI
+
+
+    # Mouse move flags, indexed by the relative parameter of mouse_move
+    _MOVE_FLAGS: tuple[int, int] = (MOUSE_EVENT_MOVE | MOUSE_EVENT_ABSOLUTE, MOUSE_EVENT_MOVE)
 
 
     def mouse_move(x: float, y: float, relative: bool) -> bool:
@@ -273,134 +429,202 @@ if os.name == "nt":
         Moves the mouse the given x, y position (in pixels) on the main monitor.
         A relative values means that x, y is treated as dx, dy to the current mouse pointer position.
         """
-        if not relative and (x < 0 or y < 0 or x > _SCREEN_WIDTH_PX or y > _SCREEN_HEIGHT_PX):
-            return False
-        flags = MOUSE_EVENT_MOVE
-        if not relative:
-            flags |= MOUSE_EVENT_ABSOLUTE
-        inp_struct = CInput(ctypes.c_ulong(INPUT_MOUSE),
-                            _CInputUnion(
-                                mi=CMouseInput(dx=int(x * _SCREEN_X_MULTIPLIER), dy=int(y * _SCREEN_Y_MULTIPLIER),
-                                               dwFlags=flags)))
-        _send_input(inp_struct)
-        return True
+        global _LAST_ABS_XY
+        if relative:
+            _LAST_ABS_XY = None
+        else:
+            # Absolute positions have to be on the screen, valid pixels range from 0 to width/height - 1
+            if not (0 <= x < _SCREEN_WIDTH_PX and 0 <= y < _SCREEN_HEIGHT_PX):
+                return False
+            if _PYWINKEYS_SKIP_REDUNDANT_MOVES:
+                # Repeated move, only skip it if the cursor has not been moved away since (e.g. by the user)
+                if _LAST_ABS_XY == (x, y) and mouse_get_xy() == (int(x), int(y)):
+                    return True
+                _LAST_ABS_XY = (x, y)
+        with _TEMPLATE_LOCK:
+            mi = _reset_mouse()
+            mi.dx = round(x * _SCREEN_X_MULTIPLIER)
+            mi.dy = round(y * _SCREEN_Y_MULTIPLIER)
+            mi.dwFlags = _MOVE_FLAGS[relative]
+            return _send_input(_MOUSE_TEMPLATE)
 
 
     def mouse_hold(mouse_btn: MouseKey) -> bool:
-        flags = 0
-        if mouse_btn is MouseKey.LEFT_BUTTON:
-            flags |= MOUSE_EVENT_LEFT_PRESS
-        elif mouse_btn is MouseKey.RIGHT_BUTTON:
-            flags |= MOUSE_EVENT_RIGHT_PRESS
-        elif mouse_btn is MouseKey.MIDDLE_BUTTON:
-            flags |= MOUSE_EVENT_MIDDLE_PRESS
-        else:
+        flags = _MOUSE_HOLD_FLAGS.get(mouse_btn)
+        if flags is None:
             return False
-        mouse_inp: CInput = CInput(ctypes.c_ulong(INPUT_MOUSE), _CInputUnion(mi=CMouseInput(dwFlags=flags)))
-        _send_input(mouse_inp)
-        return True
+        with _TEMPLATE_LOCK:
+            _reset_mouse().dwFlags = flags
+            return _send_input(_MOUSE_TEMPLATE)
 
 
     def mouse_release(mouse_btn: MouseKey) -> bool:
-        flags = 0
-        if mouse_btn is MouseKey.LEFT_BUTTON:
-            flags |= MOUSE_EVENT_LEFT_RELEASE
-        elif mouse_btn is MouseKey.RIGHT_BUTTON:
-            flags |= MOUSE_EVENT_RIGHT_RELEASE
-        elif mouse_btn is MouseKey.MIDDLE_BUTTON:
-            flags |= MOUSE_EVENT_MIDDLE_RELEASE
-        else:
+        flags = _MOUSE_RELEASE_FLAGS.get(mouse_btn)
+        if flags is None:
             return False
-        mouse_inp: CInput = CInput(ctypes.c_ulong(INPUT_MOUSE), _CInputUnion(mi=CMouseInput(dwFlags=flags)))
-        _send_input(mouse_inp)
-        return True
+        with _TEMPLATE_LOCK:
+            _reset_mouse().dwFlags = flags
+            return _send_input(_MOUSE_TEMPLATE)
 
 
     def mouse_press(mouse_btn: MouseKey) -> bool:
-        if not mouse_hold(mouse_btn):
-            return False
-        _sleep(_PYWINKEYS_TIMEOUT)
-        if not mouse_release(mouse_btn):
+        if _PYWINKEYS_TIMEOUT > 0:
+            if not mouse_hold(mouse_btn):
+                return False
+            _sleep(_PYWINKEYS_TIMEOUT)
+            if not mouse_release(mouse_btn):
+                return False
+            return True
+        # Without a timeout, the press and release can be sent together
+        hold_flags = _MOUSE_HOLD_FLAGS.get(mouse_btn)
+        if hold_flags is None:
             return False
-        return True
+        with _TEMPLATE_LOCK:
+            _MOUSE_PRESS_TEMPLATE_MI[0].dwFlags = hold_flags
+            _MOUSE_PRESS_TEMPLATE_MI[1].dwFlags = _MOUSE_RELEASE_FLAGS[mouse_btn]
+            return _send_inputs(_MOUSE_PRESS_TEMPLATE, 2)
 
 
     def mouse_scroll(ticks: int, direction: MouseScrollDirection) -> bool:
-        d_scroll: int = ticks * 120
-        if direction is MouseScrollDirection.DOWN:
-            mouse_inp = CInput(ctypes.c_ulong(INPUT_MOUSE),
-                               _CInputUnion(mi=CMouseInput(mouseData=-d_scroll, dwFlags=MOUSE_EVENT_WHEEL)))
-        elif direction is MouseScrollDirection.UP:
-            mouse_inp = CInput(ctypes.c_ulong(INPUT_MOUSE),
-                               _CInputUnion(mi=CMouseInput(mouseData=d_scroll, dwFlags=MOUSE_EVENT_WHEEL)))
-        elif direction is MouseScrollDirection.LEFT:
-            mouse_inp = CInput(ctypes.c_ulong(INPUT_MOUSE),
-                               _CInputUnion(
-                                   mi=CMouseInput(mouseData=-d_scroll, dwFlags=MOUSE_EVENT_WHEEL | MOUSE_EVENT_HWHEEL)))
-        elif direction is MouseScrollDirection.RIGHT:
-            mouse_inp = CInput(ctypes.c_ulong(INPUT_MOUSE),
-                               _CInputUnion(
-                                   mi=CMouseInput(mouseData=d_scroll, dwFlags=MOUSE_EVENT_WHEEL | MOUSE_EVENT_HWHEEL)))
-        else:
+        scroll = _MOUSE_SCROLL.get(direction)
+        if scroll is None:
             return False
-        _send_input(mouse_inp)
-        return True
+        with _TEMPLATE_LOCK:
+            mi = _reset_mouse()
+            mi.mouseData = ticks * scroll[0]
+            mi.dwFlags = scroll[1]
+            return _send_input(_MOUSE_TEMPLATE)
+
 
+    # Preallocated cursor position buffer, guarded by _TEMPLATE_LOCK like the preallocated input events
+    _POINT_BUF = CPoint()
+    _POINT_REF = ctypes.byref(_POINT_BUF)
 
-    def mouse_get_xy() -> typing.Tuple[int, int]:
-        pt = CPoint()
-        ctypes.windll.user32.GetCursorPos(ctypes.byref(pt))
-        return pt.x, pt.y
 
+    def mouse_get_xy() -> tuple[int, int]:
+        with _TEMPLATE_LOCK:
+            _GetCursorPos(_POINT_REF)
+            return _POINT_BUF.x, _POINT_BUF.y
 
-    def _keyboard_hold(key_code: int) -> None:
-        key_inp = CInput(ctypes.c_ulong(INPUT_KEYBOARD), _CInputUnion(ki=CKeyBdInput(wVk=key_code)))
-        _send_input(key_inp)
 
+    def _keyboard_hold(key_code: int) -> bool:
+        scan_code, flags = _SCAN_CODES.get(key_code) or _scan_code_event(key_code)
+        with _TEMPLATE_LOCK:
+            _KBD_TEMPLATE_KI.wVk = key_code
+            _KBD_TEMPLATE_KI.wScan = scan_code
+            _KBD_TEMPLATE_KI.dwFlags = flags
+            return _send_input(_KBD_TEMPLATE)
 
-    def _keyboard_release(key_code: int) -> None:
-        key_inp = CInput(ctypes.c_ulong(INPUT_KEYBOARD),
-                         _CInputUnion(ki=CKeyBdInput(wVk=key_code, dwFlags=KEY_EVENT_RELEASE)))
-        _send_input(key_inp)
+
+    def _keyboard_release(key_code: int) -> bool:
+        scan_code, flags = _SCAN_CODES.get(key_code) or _scan_code_event(key_code)
+        with _TEMPLATE_LOCK:
+            _KBD_TEMPLATE_KI.wVk = key_code
+            _KBD_TEMPLATE_KI.wScan = scan_code
+            _KBD_TEMPLATE_KI.dwFlags = flags | KEY_EVENT_RELEASE
+            return _send_input(_KBD_TEMPLATE)
 
 
     def keyboard_press(key: str) -> bool:
         """
         Press the given keyboard key, if successful return true otherwise return false
         """
-        key_code = _get_hex_code(key)
-        if key_code is None:
+        key_hold = _KEY_HOLD.get(key)
+        if key_hold is None:
             return False
-        _keyboard_hold(key_code)
-        _sleep(_PYWINKEYS_TIMEOUT)
-        _keyboard_release(key_code)
-        return True
+        if _PYWINKEYS_TIMEOUT > 0:
+            # Nothing to release if the hold was not inserted
+            if not _send_input(key_hold):
+                return False
+            _sleep(_PYWINKEYS_TIMEOUT)
+            return _send_input(_KEY_RELEASE[key])
+        # Without a timeout, the press and release can be sent together
+        return _send_inputs((CInput * 2)(key_hold, _KEY_RELEASE[key]), 2)
 
 
-    def keyboard_press_combo(key_set: str) -> bool:
+    @functools.lru_cache(maxsize=256)
+    def _combo_inputs(combo: str) -> tuple[ctypes.Array, ctypes.Array, ctypes.Array] | None:
         """
-        Executes a combination of keys delimited by +, for example 'ctrl + alt + delete'. Spaces are ignored.
-        See the initialization of _win_key to see the (case-sensitive) names required.
+        Assembles the input events of a normalized key combo once, repeated combos reuse the cached arrays.
+        :param combo: Key names delimited by +, without whitespace and in lowercase.
+        :return: (holds, releases, holds followed by releases) None if the combo is invalid.
         """
-        keys = key_set.replace(" ", "").split("+")
-        handled_keys = set()  # Set to make sure we don't try to do something stupid like "Ctrl + Ctrl + A"
-        key_codes: typing.List[int, ...] = []
+        keys = combo.split("+")
+        # Make sure we don't try to do something stupid like "Ctrl + Ctrl + A"
+        if len(keys) != len(set(keys)):
+            return None
+        holds: list[CInput] = []
         for key in keys:
-            key_code = _get_hex_code(key)
-            if key_code is None or key_code in handled_keys:
-                return False
-            handled_keys.add(key_code)
-            key_codes.append(key_code)
-        # Now we got a list of keys that we can handle
-        # Press in sequence
-        for key_code in key_codes:
-            _keyboard_hold(key_code)
-            _sleep(_PYWINKEYS_SEQUENCE_DELAY)
-        _sleep(_PYWINKEYS_TIMEOUT)
+            key_hold = _KEY_HOLD.get(key)
+            if key_hold is None:
+                return None
+            holds.append(key_hold)
         # Release in reversed sequence
-        for key_code in reversed(key_codes):
-            _keyboard_release(key_code)
-            _sleep(_PYWINKEYS_SEQUENCE_DELAY)
-        return True
+        releases: list[CInput] = [_KEY_RELEASE[key] for key in reversed(keys)]
+        return ((CInput * len(holds))(*holds), (CInput * len(releases))(*releases),
+                (CInput * (len(holds) + len(releases)))(*holds, *releases))
+
+
+    def keyboard_press_combo(key_set: str) -> bool:
+        """
+        Executes a combination of keys delimited by +, for example 'ctrl + alt + delete'. Whitespace is ignored and
+        the key names are case-insensitive, see the initialization of _win_key to see the names required.
+        """
+        inputs = _combo_inputs(key_set.translate(_COMBO_TABLE))
+        if inputs is None:
+            return False
+        holds, releases, press = inputs
+        n = len(holds)
+        # Now we got a list of keys that we can handle
+        if _PYWINKEYS_SEQUENCE_DELAY > 0:
+            # Press in sequence, stop at the first hold that was not inserted
+            held = 0
+            for key_inp in holds:
+                if not _send_input(key_inp):
+                    break
+                held += 1
+                _sleep(_PYWINKEYS_SEQUENCE_DELAY)
+            _sleep(_PYWINKEYS_TIMEOUT)
+            # Only release the keys that are held, the releases are in reversed sequence
+            success = held == n
+            for key_inp in releases[n - held:]:
+                success = _send_input(key_inp) and success
+                _sleep(_PYWINKEYS_SEQUENCE_DELAY)
+            return success
+        # Without a sequence delay, all holds (and all releases) can be sent together
+        if _PYWINKEYS_TIMEOUT > 0:
+            success = _send_inputs(holds, n)
+            _sleep(_PYWINKEYS_TIMEOUT)
+            # Always release, even if not all holds were inserted
+            return _send_inputs(releases, n) and success
+        return _send_inputs(press, 2 * n)
+
+
+    # Raw bytes of a unicode key hold followed by its release, the scan code is filled in per character
+    _UNICODE_PRESS_TEMPLATE: bytes = bytes((CInput * 2)(
+        CInput(_C_INPUT_KEYBOARD, _CInputUnion(ki=CKeyBdInput(dwFlags=KEY_EVENT_UNICODE))),
+        CInput(_C_INPUT_KEYBOARD, _CInputUnion(ki=CKeyBdInput(dwFlags=KEY_EVENT_UNICODE | KEY_EVENT_RELEASE)))))
+    # Index of wScan in a CInput, counted in 16-bit units
+    _WSCAN_INDEX: int = (CInput.u.offset + CKeyBdInput.wScan.offset) // 2
+
+
+    def keyboard_press_sequence(sequence: str) -> bool:
+        """
+        Writes the given sequence of characters using unicode keyboard events, all characters are pressed and released
+        with a single SendInput call. Unlike keyboard_press this is not limited to the keys of _win_key.
+        Returns false if not all input events could be inserted.
+        """
+        # Characters outside the basic multilingual plane are sent as two UTF-16 surrogates
+        code_units = memoryview(sequence.encode('utf-16-le')).cast('H')
+        n = len(code_units)
+        if n == 0:
+            return True
+        # Copy the unicode press template into every event at once, then fill in the scan codes (code units) of
+        # the holds and releases through strided views of the event array
+        inputs = (CInput * (2 * n)).from_buffer_copy(_UNICODE_PRESS_TEMPLATE * n)
+        scan_codes = memoryview(inputs).cast('B').cast('H')[_WSCAN_INDEX::_CINPUT_SIZE // 2]
+        scan_codes[0::2] = code_units
+        scan_codes[1::2] = code_units
+        return _send_inputs(inputs, 2 * n)
 else:
     raise NotImplementedError("The winkeys API is only support for Windows!")